@@ -1,64 +1,309 @@
+import asyncio
+import logging
 import os
+import threading
+from datetime import date
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Iterable
 from helper_classes.url_factory import create_handlers_from_yaml
+from utils.columnar import to_columnar
 from utils.yaml_reader import load_yaml_file
 
+if TYPE_CHECKING:
+    import httpx
+
+log = logging.getLogger(__name__)
+
 class F1DataPipeline:
-    def __init__(self, config_path: str = None, config_file: str = None):
+    def __init__(self, config_path: str = None, config_file: str = None,
+                 cache_dir: str = None, max_concurrency: int = 4,
+                 warmup_url: str = "https://api.jolpi.ca/ergast/f1",
+                 record_pages: bool = True):
         """
         Initialize the F1 data pipeline.
         
         Args:
             config_path: Path to the config directory
             config_file: Name of the YAML config file
+            cache_dir: Directory for the HTTP response cache (used when hishel is installed)
+            max_concurrency: Maximum number of requests in flight at once (API rate limit)
+            warmup_url: URL used to pre-open the shared client's connection, None disables it
+            record_pages: Store endpoints with a record_path as record pages
+                instead of their full payload
         """
         self.project_root = str(Path(__file__).parent)
         self.config_path = config_path or os.path.join(self.project_root, 'config')
         self.config_file = config_file or 'race_config.yaml'
+        self.cache_dir = cache_dir or os.path.join(self.project_root, '.http_cache')
+        self.max_concurrency = max_concurrency
+        # Seasons before this one are immutable and served from cache without revalidation
+        self.current_season = date.today().year
+        self.warmup_url = warmup_url
+        self.record_pages = record_pages
         self.handlers = {}
         self.data = {}
+        self._client = None
+        self._warmup_thread = None
+    
+    @property
+    def client(self) -> 'httpx.Client':
+        """Shared keep-alive client reused by every synchronous handler call"""
+        self._join_warmup()
+        if self._client is None:
+            from utils.http_client import build_client
+            self._client = build_client(self.cache_dir)
+        return self._client
+    
+    def close(self):
+        """Close the shared client and release its pooled connections"""
+        self._join_warmup()
+        if getattr(self, '_client', None) is not None:
+            self._client.close()
+            self._client = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+        
+    def _start_warmup(self):
+        """Open the shared client's first connection in the background"""
+        if self._client is not None or self._warmup_thread is not None or not self.warmup_url:
+            return
+        self._warmup_thread = threading.Thread(target=self._warm_up, name='f1-client-warmup', daemon=True)
+        self._warmup_thread.start()
+    
+    def _warm_up(self):
+        """Build the shared client and pay DNS + TCP/TLS setup with a HEAD request"""
+        from utils.http_client import build_client
+        client = build_client(self.cache_dir)
+        try:
+            client.head(self.warmup_url)
+        except Exception:
+            # Best effort only; the first real request reports connection errors
+            pass
+        self._client = client
+    
+    def _join_warmup(self):
+        """Wait for a running warm-up so the shared client is ready to use"""
+        thread = getattr(self, '_warmup_thread', None)
+        if thread is not None:
+            # __del__ can run on the warm-up thread once it drops the last reference
+            if thread is not threading.current_thread():
+                thread.join()
+            self._warmup_thread = None
+    
+    def initialize(self, warmup: bool = False):
+        """
+        Initialize the pipeline by loading configuration and creating handlers
+        
+        Args:
+            warmup: Open the shared client's connection in a background thread
+                while the configuration is parsed (used by fetch_data)
+        """
+        if warmup:
+            self._start_warmup()
         
-    def initialize(self):
-        """Initialize the pipeline by loading configuration and creating handlers"""
         try:
             # Load configuration
             config = load_yaml_file(os.path.join(self.config_path, self.config_file))
             if not config:
                 raise ValueError("Failed to load configuration")
                 
-            # Create handlers
-            self.handlers = create_handlers_from_yaml(self.config_path, self.config_file)
-            print(f"Initialized pipeline with {len(self.handlers)} endpoints")
+            self.current_season = config.get('api_config', {}).get('current_year', self.current_season)
+            
+            # Register handlers from the config parsed above; each is built on first use
+            self.handlers = create_handlers_from_yaml(self.config_path, self.config_file, config, lazy=True)
+            log.info("Initialized pipeline with %d endpoints", len(self.handlers))
             return True
             
         except Exception as e:
-            print(f"Failed to initialize pipeline: {str(e)}")
+            log.error("Failed to initialize pipeline: %s", e)
             return False
     
     def fetch_all_data(self) -> Dict[str, Any]:
-        """Fetch data from all configured endpoints"""
+        """
+        Fetch data from all configured endpoints
+        
+        Runs its own event loop; inside a running loop (e.g. Jupyter) use
+        await fetch_all_data_async() instead.
+        """
+        self._check_no_running_loop('fetch_all_data_async()')
+        return asyncio.run(self.fetch_all_data_async())
+    
+    async def fetch_all_data_async(self) -> Dict[str, Any]:
+        """
+        Fetch data from all configured endpoints concurrently over one shared client
+        
+        With record_pages, endpoints with a record_path (results, pit stops,
+        laps) are stored as a record page: the MRData limit/offset/total
+        pagination fields plus 'records', a columnar pyarrow.Table or a list of
+        records without pyarrow.
+        fetch_data stores the same shape.
+        """
         if not self.handlers:
             if not self.initialize():
                 return {}
-                
-        for name, handler in self.handlers.items():
-            try:
-                print(f"Fetching data for {name}...")
-                response = handler.get_data()
-                if response.resp_msg == "Success":
-                    self.data[name] = response.data
-                    print(f"Successfully fetched {name} data")
-                else:
-                    print(f"Failed to fetch {name}: {response.resp_msg}")
-            except Exception as e:
-                print(f"Error fetching {name}: {str(e)}")
+        
+        handlers = {}
+        for name in self.handlers:
+            handler = self.get_handler(name)
+            if handler is not None:
+                handlers[name] = handler
+        names = list(handlers)
+        async with self._async_client() as client:
+            for name in names:
+                log.info("Fetching data for %s...", name)
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            requests = [
+                handlers[name].fetch(client, record_page=self.record_pages,
+                                     force_cache=self._is_past_season(handlers[name]))
+                for name in names
+            ]
+            results = await asyncio.gather(
+                *(self._bounded(semaphore, request) for request in requests),
+                return_exceptions=True
+            )
+        
+        for name, response in zip(names, results):
+            if isinstance(response, Exception):
+                log.error("Error fetching %s: %s", name, response)
+            elif response.resp_msg == "Success":
+                self.data[name] = self._columnar_page(response.data)
+                log.info("Successfully fetched %s data", name)
+            else:
+                log.warning("Failed to fetch %s: %s", name, response.resp_msg)
                 
         return self.data
     
+    def fetch_season(self, year: int, races: Iterable[int]) -> Dict[str, Any]:
+        """
+        Fetch all year- and race-dependent endpoints for one season
+        
+        Runs its own event loop; inside a running loop (e.g. Jupyter) use
+        await fetch_season_async(year, races) instead.
+        """
+        self._check_no_running_loop('fetch_season_async(year, races)')
+        return asyncio.run(self.fetch_season_async(year, races))
+    
+    async def fetch_season_async(self, year: int, races: Iterable[int]) -> Dict[str, Any]:
+        """
+        Fetch all year- and race-dependent endpoints for one season concurrently
+        
+        URLs come from each handler's url_for, so the shared handlers are
+        neither rebuilt nor re-pointed. An out-of-range year or race raises
+        ValueError before any request is sent.
+        
+        Args:
+            year: Season to fetch
+            races: Race rounds to fetch the race-dependent endpoints for
+            
+        Returns:
+            Dict mapping year-dependent endpoints to their data and
+            race-dependent endpoints to {race_round: data}
+        """
+        if not self.handlers:
+            if not self.initialize():
+                return {}
+        
+        races = list(races)
+        jobs = []  # (endpoint name, race round or None, handler, url)
+        for name in self.handlers:
+            handler = self.get_handler(name)
+            if handler is None:
+                continue
+            if handler.config.race_dependent:
+                for race in races:
+                    jobs.append((name, race, handler, handler.url_for(year=year, race=race)))
+            elif handler.config.year_dependent:
+                jobs.append((name, None, handler, handler.url_for(year=year)))
+        
+        async with self._async_client() as client:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            force_cache = year < self.current_season
+            requests = [
+                handler.fetch(client, url, record_page=self.record_pages, force_cache=force_cache)
+                for _, _, handler, url in jobs
+            ]
+            results = await asyncio.gather(
+                *(self._bounded(semaphore, request) for request in requests),
+                return_exceptions=True
+            )
+        
+        season = {}
+        for (name, race, _, url), response in zip(jobs, results):
+            if isinstance(response, Exception):
+                log.error("Error fetching %s: %s", url, response)
+            elif response.resp_msg != "Success":
+                log.warning("Failed to fetch %s: %s", url, response.resp_msg)
+            elif race is None:
+                season[name] = self._columnar_page(response.data)
+            else:
+                season.setdefault(name, {})[race] = self._columnar_page(response.data)
+                
+        return season
+    
+    @staticmethod
+    def _check_no_running_loop(async_call: str) -> None:
+        """Raise before asyncio.run would fail (and leak the coroutine) inside a running loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        raise RuntimeError(f"An event loop is already running; use 'await pipeline.{async_call}' instead")
+    
+    @staticmethod
+    def _columnar_page(data: Any) -> Any:
+        """Convert the records of a record page to columnar form; other payloads pass through"""
+        if isinstance(data, dict) and 'records' in data:
+            return {**data, 'records': to_columnar(data['records'])}
+        return data
+    
+    def _is_past_season(self, handler) -> bool:
+        """Whether a handler points at a finished season whose data can no longer change"""
+        return handler.config.year_dependent and handler.config.current_year < self.current_season
+    
+    @staticmethod
+    async def _bounded(semaphore: asyncio.Semaphore, request):
+        """Await a request while holding one of the semaphore's slots"""
+        async with semaphore:
+            return await request
+    
+    def _async_client(self) -> 'httpx.AsyncClient':
+        """New pooled AsyncClient for one batch of concurrent requests"""
+        from utils.http_client import build_async_client
+        return build_async_client(self.cache_dir)
+    
     def get_handler(self, endpoint_name: str):
-        """Get a specific handler by name"""
-        return self.handlers.get(endpoint_name)
+        """Get a specific handler by name, None if it is unknown or cannot be built"""
+        try:
+            return self.handlers.get(endpoint_name)
+        except Exception as e:
+            log.error("Error building handler for %s: %s", endpoint_name, e)
+            return None
+    
+    def fetch_data(self, endpoint_name: str):
+        """Fetch data from a specific endpoint over the shared client"""
+        if not self.handlers:
+            # Overlap the shared client's connection setup with config parsing
+            if not self.initialize(warmup=True):
+                self._join_warmup()
+                return None
+                
+        handler = self.get_handler(endpoint_name)
+        if handler is None:
+            # Don't leave the warm-up thread holding the last reference to the pipeline
+            self._join_warmup()
+            return None
+        response = handler.get_data(self.client, force_cache=self._is_past_season(handler),
+                                    record_page=self.record_pages)
+        if response.resp_msg == "Success":
+            self.data[endpoint_name] = self._columnar_page(response.data)
+        return response
     
     def get_data(self, endpoint_name: str):
         """Get data from a specific endpoint"""
@@ -68,14 +313,16 @@ class F1DataPipeline:
 
 # Example usage
 if __name__ == "__main__":
-    # Initialize the pipeline
-    pipeline = F1DataPipeline()
+    from utils.logging_setup import configure_logging
+    configure_logging()
     
-    # Option 1: Fetch all data
-    all_data = pipeline.fetch_all_data()
-    
-    # Option 2: Get a specific handler and fetch data
-    race_handler = pipeline.get_handler('race')
-    if race_handler:
-        race_data = race_handler.get_data()
-        print(f"Race data: {race_data}")
\ No newline at end of file
+    # Initialize the pipeline
+    with F1DataPipeline() as pipeline:
+        # Option 1: Fetch all data
+        all_data = pipeline.fetch_all_data()
+        
+        # Option 2: Get a specific handler and fetch data over the shared client
+        race_handler = pipeline.get_handler('race')
+        if race_handler:
+            race_data = race_handler.get_data(pipeline.client)
+            log.info("Race data: %s", race_data)
\ No newline at end of file
@@ -1,23 +1,58 @@
-from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, Union
+import asyncio
+from abc import ABC
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, NamedTuple, Union
 from pydantic import BaseModel, HttpUrl, Field, validator
-import httpx
 
+if TYPE_CHECKING:
+    # Clients are injected by the caller, so httpx is only needed for annotations
+    import httpx
 
-class APIResponse(BaseModel):
-    """Pydantic model for API response data structure"""
-    data: Optional[Dict[str, Any]]
-    resp_msg: str = Field(..., description="Response status message")
-    
-    @validator('resp_msg')
-    def validate_resp_msg(cls, v):
-        if v not in ["Success", "Failed"]:
-            raise ValueError("resp_msg must be either 'Success' or 'Failed'")
-        return v
-    
-    class Config:
-        extra = 'forbid'  # Forbid extra fields
-        frozen = True  # Make the model immutable
+try:
+    # Native parser straight from the response bytes, much faster on large payloads
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    # Incremental parser for iter_records
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _cache_extensions(force_cache: bool) -> Optional[Dict[str, Any]]:
+    """Request extensions telling a hishel cache transport to skip revalidation"""
+    return {'force_cache': True} if force_cache else None
+
+
+def _extract_records(data: Any, record_path: str) -> List[Any]:
+    """Walk an already parsed payload along an ijson-style prefix ('item' = list element)"""
+    items = [data]
+    for key in record_path.split('.'):
+        if key == 'item':
+            items = [item for value in items for item in value]
+        else:
+            items = [value[key] for value in items if key in value]
+    return items
+
+
+# Pagination fields of the Ergast/Jolpica MRData envelope kept next to the records
+_PAGE_KEYS = ('limit', 'offset', 'total')
+
+
+def _record_page(data: Dict[str, Any], record_path: str) -> Dict[str, Any]:
+    """Record page (pagination fields + records) from an already parsed payload"""
+    envelope = data.get('MRData', {})
+    page = {key: envelope.get(key) for key in _PAGE_KEYS}
+    page['records'] = _extract_records(data, record_path)
+    return page
+
+
+class APIResponse(NamedTuple):
+    """Immutable API response returned by the handlers"""
+    data: Optional[Union[Dict[str, Any], List[Any]]]
+    resp_msg: str  # "Success" or a failure/error description
 
 
 class URLConfig(BaseModel):
@@ -37,78 +72,252 @@ class URLConfig(BaseModel):
         return v
 
 
+@dataclass(slots=True, frozen=True)
+class _URLConfig:
+    """Lightweight URL configuration used on the handler construction path"""
+    url: Optional[str]
+    template_url: Optional[str]
+    year_dependent: bool
+    race_dependent: bool
+    current_race: int
+    current_year: int
+    
+    def __post_init__(self):
+        # Coerce like the Pydantic model does, e.g. current_year: "2024" from YAML
+        for field in ('current_year', 'current_race'):
+            value = getattr(self, field)
+            try:
+                object.__setattr__(self, field, int(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} must be an integer, got {value!r}") from None
+        if self.race_dependent or self.year_dependent:
+            placeholder = '{race_round}' if self.race_dependent else '{year}'
+            if not self.template_url or placeholder not in self.template_url:
+                raise ValueError(f"template_url is required and must contain {placeholder} placeholder")
+        elif not self.url:
+            raise ValueError("url is required when not using template_url")
+        if not 1950 <= self.current_year <= 2100 or not 0 <= self.current_race <= 30:
+            raise ValueError("current_year must be in 1950-2100 and current_race in 0-30")
+
+
 class URLBase(ABC):
-    """Base class for URL handling with Pydantic validation"""
+    """Base class for URL handling with optional Pydantic validation"""
     
     def __init__(self, url: Optional[str] = None, template_url: Optional[str] = None,
                  year_dependent: bool = False, race_dependent: bool = False,
-                 current_race: int = 0, current_year: int = 2023):
-        # Validate inputs using Pydantic model
-        self.config = URLConfig(
-            url=url,
-            template_url=template_url,
-            year_dependent=year_dependent,
-            race_dependent=race_dependent,
-            current_race=current_race,
-            current_year=current_year
+                 current_race: int = 0, current_year: int = 2023, validate: bool = False,
+                 record_path: Optional[str] = None):
+        # ijson-style prefix of the records in the payload, enables record pages
+        self.record_path = record_path
+        
+        if validate:
+            # Full Pydantic validation (URL syntax, field types) for untrusted input
+            checked = URLConfig(
+                url=url,
+                template_url=template_url,
+                year_dependent=year_dependent,
+                race_dependent=race_dependent,
+                current_race=current_race,
+                current_year=current_year
+            )
+            # Use the coerced values, e.g. current_year="2024" -> 2024
+            url = str(checked.url) if checked.url else None
+            template_url = checked.template_url
+            year_dependent = checked.year_dependent
+            race_dependent = checked.race_dependent
+            current_race = checked.current_race
+            current_year = checked.current_year
+        
+        self.config = _URLConfig(
+            url, template_url, year_dependent, race_dependent, current_race, current_year
         )
         
         # Build the final URL based on configuration
         self._build_url()
     
+    def _format_url(self, config: _URLConfig) -> str:
+        """Format the template (or return the static URL) for the given config"""
+        if config.year_dependent or config.race_dependent:
+            values = {}
+            if config.year_dependent:
+                values['year'] = config.current_year
+            if config.race_dependent:
+                values['race_round'] = config.current_race
+            return config.template_url.format_map(values)
+        return config.url
+    
     def _build_url(self) -> None:
         """Build the final URL based on configuration"""
-        if self.config.year_dependent and self.config.race_dependent:
-            self.url = self.config.template_url.format(
-                year=self.config.current_year,
-                race_round=self.config.current_race
-            )
-        elif self.config.year_dependent:
-            self.url = self.config.template_url.format(
-                year=self.config.current_year
+        self.url = self._format_url(self.config)
+    
+    @staticmethod
+    def _context_changes(year: Optional[int], race: Optional[int]) -> Dict[str, int]:
+        """Config fields to replace for a set_context/url_for call"""
+        changes = {}
+        if year is not None:
+            changes['current_year'] = year
+        if race is not None:
+            changes['current_race'] = race
+        return changes
+    
+    def url_for(self, year: Optional[int] = None, race: Optional[int] = None) -> str:
+        """
+        URL for another season and/or race round, leaving the handler unchanged
+        
+        Args:
+            year: Season to use, the configured one if None
+            race: Race round to use, the configured one if None
+            
+        Returns:
+            The URL; ValueError if the year or race is out of range
+        """
+        return self._format_url(replace(self.config, **self._context_changes(year, race)))
+    
+    def set_context(self, year: Optional[int] = None, race: Optional[int] = None) -> None:
+        """
+        Point the handler at another season and/or race round
+        
+        Only the URL is re-formatted; the handler is not rebuilt.
+        
+        Args:
+            year: New season, unchanged if None
+            race: New race round, unchanged if None
+        """
+        self.config = replace(self.config, **self._context_changes(year, race))
+        self._build_url()
+    
+    def get_data(self, client: 'httpx.Client', force_cache: bool = False,
+                 record_page: bool = False) -> APIResponse:
+        """
+        Fetch data for this URL using a shared client
+        
+        Args:
+            client: Client owned by the caller and reused across handlers
+            force_cache: Serve from the response cache without revalidating
+                (for immutable past-season data)
+            record_page: Reduce the payload to its record page; ignored when the
+                handler has no record_path
+            
+        Returns:
+            APIResponse with the parsed JSON payload (or record page) or the
+            failure message
+        """
+        try:
+            response = client.get(self.url, extensions=_cache_extensions(force_cache))
+            if response.status_code == 200:
+                return APIResponse(
+                    data=self._parse(response.content, record_page),
+                    resp_msg="Success"
+                )
+            return APIResponse(
+                data=None,
+                resp_msg=f"Failed with status code: {response.status_code}"
             )
-        elif self.config.race_dependent:
-            self.url = self.config.template_url.format(
-                race_round=self.config.current_race
+        except Exception as e:
+            return APIResponse(
+                data=None,
+                resp_msg=f"Error: {str(e)}"
             )
-        else:
-            if not self.config.url:
-                raise ValueError("url is required when not using template_url")
-            self.url = self.config.url
     
-    @abstractmethod
-    def get_data(self) -> APIResponse:
-        pass
+    def iter_records(self, client: 'httpx.Client'):
+        """
+        Stream this URL and yield the records under record_path one at a time
+        
+        Peak memory stays at one record plus the current chunk instead of the
+        whole decoded payload.
+        
+        Args:
+            client: Client owned by the caller and reused across handlers
+            
+        Yields:
+            Records found at record_path
+        """
+        if not self.record_path:
+            raise ValueError("record_path is required to stream records")
+        
+        with client.stream('GET', self.url) as response:
+            response.raise_for_status()
+            if ijson is None:
+                yield from _extract_records(_json_loads(response.read()), self.record_path)
+                return
+            
+            records = ijson.sendable_list()
+            parser = ijson.items_coro(records, self.record_path, use_float=True)
+            for chunk in response.iter_bytes():
+                parser.send(chunk)
+                yield from records
+                del records[:]
+            parser.close()
+            yield from records
+    
+    def _parse(self, content: bytes, record_page: bool) -> Any:
+        """Decode a payload, reduced to its record page when requested and supported"""
+        data = _json_loads(content)
+        if record_page and self.record_path:
+            return _record_page(data, self.record_path)
+        return data
+    
+    async def fetch(self, client: 'httpx.AsyncClient', url: Optional[str] = None,
+                    retries: int = 3, backoff: float = 0.5, record_page: bool = False,
+                    force_cache: bool = False) -> APIResponse:
+        """
+        Fetch data for this URL using a shared async client
+        
+        Rate-limited (429) responses are retried with exponential backoff,
+        honouring a numeric Retry-After header when the server sends one,
+        clamped to 0..backoff * 2 ** retries seconds.
+        
+        Args:
+            client: AsyncClient owned by the caller and reused across handlers
+            url: URL captured earlier from this handler, defaults to the current one
+            retries: Number of retries after a 429 response
+            backoff: Delay in seconds before the first retry, doubled each attempt
+            record_page: Reduce the payload to its record page; ignored when the
+                handler has no record_path
+            force_cache: Serve from the response cache without revalidating
+                (for immutable past-season data)
+            
+        Returns:
+            APIResponse with the parsed JSON payload (or record page) or the
+            failure message
+        """
+        try:
+            request = client.build_request('GET', url or self.url, extensions=_cache_extensions(force_cache))
+            for attempt in range(retries + 1):
+                response = await client.send(request)
+                if response.status_code != 429 or attempt == retries:
+                    break
+                try:
+                    delay = float(response.headers.get('Retry-After'))
+                except (TypeError, ValueError):
+                    delay = backoff * 2 ** attempt
+                # Never let the server park a semaphore slot longer than the whole backoff schedule
+                await asyncio.sleep(min(max(delay, 0.0), backoff * 2 ** retries))
+            
+            if response.status_code == 200:
+                return APIResponse(
+                    data=self._parse(response.content, record_page),
+                    resp_msg="Success"
+                )
+            return APIResponse(
+                data=None,
+                resp_msg=f"Failed with status code: {response.status_code}"
+            )
+        except Exception as e:
+            return APIResponse(
+                data=None,
+                resp_msg=f"Error: {str(e)}"
+            )
 
 
 class StaticURL(URLBase):
     """Class for handling static URLs that don't change based on year or race"""
     
-    def __init__(self, url: str):
+    def __init__(self, url: str, validate: bool = False):
         if not url:
             raise ValueError("URL cannot be empty for StaticURL")
-        super().__init__(url=url, year_dependent=False, race_dependent=False)
+        super().__init__(url=url, year_dependent=False, race_dependent=False, validate=validate)
     
-    def get_data(self) -> APIResponse:
-        """Implementation of abstract method from URLBase"""
-        with httpx.Client() as client:
-            try:
-                response = client.get(self.url)
-                if response.status_code == 200:
-                    return APIResponse(
-                        data=response.json(),
-                        resp_msg="Success"
-                    )
-                return APIResponse(
-                    data=None,
-                    resp_msg=f"Failed with status code: {response.status_code}"
-                )
-            except Exception as e:
-                return APIResponse(
-                    data=None,
-                    resp_msg=f"Error: {str(e)}"
-                )
-
 class YearDependentURL(URLBase):
     """Class for handling URLs that depend on the year"""
     
@@ -121,9 +330,6 @@ class YearDependentURL(URLBase):
             current_year: The year to use in the URL
             **kwargs: Additional arguments to pass to URLBase
         """
-        if not template_url or "{year}" not in template_url:
-            raise ValueError("template_url is required and must contain {year} placeholder")
-            
         super().__init__(
             template_url=template_url,
             year_dependent=year_dependent,
@@ -132,26 +338,6 @@ class YearDependentURL(URLBase):
             **kwargs
         )
     
-    def get_data(self) -> APIResponse:
-        """Implementation of abstract method from URLBase"""
-        with httpx.Client() as client:
-            try:
-                response = client.get(self.url)
-                if response.status_code == 200:
-                    return APIResponse(
-                        data=response.json(),
-                        resp_msg="Success"
-                    )
-                return APIResponse(
-                    data=None,
-                    resp_msg=f"Failed with status code: {response.status_code}"
-                )
-            except Exception as e:
-                return APIResponse(
-                    data=None,
-                    resp_msg=f"Error: {str(e)}"
-                )
-        
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> 'YearDependentURL':
         """Create a YearDependentURL from a configuration dictionary"""
@@ -171,9 +357,6 @@ class RaceDependentURL(URLBase):
             current_race: The race number to use in the URL
             **kwargs: Additional arguments to pass to URLBase
         """
-        if not template_url or "{race_round}" not in template_url:
-            raise ValueError("template_url is required and must contain {race_round} placeholder")
-            
         super().__init__(
             template_url=template_url,
             year_dependent=True,
@@ -183,101 +366,7 @@ class RaceDependentURL(URLBase):
             **kwargs
         )
     
-    def get_data(self) -> APIResponse:
-        """Implementation of abstract method from URLBase"""
-        with httpx.Client() as client:
-            try:
-                response = client.get(self.url)
-                if response.status_code == 200:
-                    return APIResponse(
-                        data=response.json(),
-                        resp_msg="Success"
-                    )
-                return APIResponse(
-                    data=None,
-                    resp_msg=f"Failed with status code: {response.status_code}"
-                )
-            except Exception as e:
-                return APIResponse(
-                    data=None,
-                    resp_msg=f"Error: {str(e)}"
-                )
-        
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> 'RaceDependentURL':
         """Create a RaceDependentURL from a configuration dictionary"""
         return cls(**config)
-
-## STATIC URLS ###
-class F1_status_url(StaticURL):
-    """Class for handling static URLs that don't change based on year or race"""
-    def __init__(self,url):
-        super().__init__(url)
-
-class F1_season_url(StaticURL):
-    """Class for handling static URLs that don't change based on year or race"""
-    def __init__(self,url):
-        super().__init__(url)
-
-class F1_circuit_url(StaticURL):
-    """Class for handling static URLs that don't change based on year or race"""
-    def __init__(self,url):
-        super().__init__(url)
-
-################### YEAR DEPENDENT URL ###################
-class F1_race_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_constructor_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_driver_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_result_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)  
-
-class F1_sprint_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_qualify_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_standings_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_constructorstanding_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-class F1_driverstanding_url(YearDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,year_dependent,current_year):
-        super().__init__(template_url,year_dependent,current_year)
-
-################### RACE DEPENDENT URL ##################
-
-class F1_pitstop_url(RaceDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,race_dependent,current_year,current_race):
-        super().__init__(template_url,race_dependent,current_year,current_race)
-
-class F1_lap_url(RaceDependentURL):
-    """Class for handling URLs that depend on the year"""
-    def __init__(self,template_url,race_dependent,current_year,current_race):
-        super().__init__(template_url,race_dependent,current_year,current_race)
\ No newline at end of file
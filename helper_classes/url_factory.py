@@ -1,39 +1,35 @@
-from typing import Dict, Any, List, Union
-from .url_classes_abc import (
-    F1_status_url, F1_season_url, F1_circuit_url,
-    F1_race_url, F1_constructor_url, F1_driver_url, F1_result_url,
-    F1_sprint_url, F1_qualify_url, F1_standings_url,
-    F1_constructorstanding_url, F1_driverstanding_url,
-    F1_pitstop_url, F1_lap_url
-)
+import copy
+import json
+from typing import Dict, Any, List, Mapping, Optional, Union
+from .url_classes_abc import StaticURL, YearDependentURL, RaceDependentURL, _URLConfig
 
 class URLFactory:
     """Factory class to create URL handler instances from YAML configuration"""
     
-    # Map endpoint names to their corresponding classes
-    STATIC_ENDPOINTS = {
-        'status': F1_status_url,
-        'season': F1_season_url,
-        'circuit': F1_circuit_url,
-    }
+    # Supported endpoint names per kind; the YAML section decides the handler class
+    STATIC_ENDPOINTS = {'status', 'season', 'circuit'}
     
     YEAR_DEPENDENT_ENDPOINTS = {
-        'race': F1_race_url,
-        'constructor': F1_constructor_url,
-        'driver': F1_driver_url,
-        'result': F1_result_url,
-        'sprint': F1_sprint_url,
-        'qualify': F1_qualify_url,
-        'standings': F1_standings_url,
-        'constructorstanding': F1_constructorstanding_url,
-        'driverstanding': F1_driverstanding_url,
+        'race', 'constructor', 'driver', 'result', 'sprint', 'qualifying',
+        'standings', 'constructorstanding', 'driverstanding',
     }
     
-    RACE_DEPENDENT_ENDPOINTS = {
-        'pitstop': F1_pitstop_url,
-        'lap': F1_lap_url,
+    RACE_DEPENDENT_ENDPOINTS = {'pitstop', 'lap'}
+    
+    # Record prefixes for record pages and iter_records
+    RECORD_PATHS = {
+        'result': 'MRData.RaceTable.Races.item',
+        'pitstop': 'MRData.RaceTable.Races.item.PitStops.item',
+        'lap': 'MRData.RaceTable.Races.item.Laps.item',
     }
     
+    # YAML sections holding endpoint definitions, in build order
+    CONFIG_SECTIONS = ('static_endpoints', 'year_dependent_endpoints', 'race_specific_endpoints')
+    
+    # Handlers built by get_handler, keyed on (section, name, endpoint settings as JSON)
+    _handler_cache: Dict[Any, Any] = {}
+    _HANDLER_CACHE_SIZE = 64
+    
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -47,37 +43,105 @@ class URLFactory:
         """
         handlers = {}
         
+        for section in cls.CONFIG_SECTIONS:
+            for name, endpoint_config in config.get(section, {}).items():
+                handler = cls._build_handler(section, name, endpoint_config)
+                if handler is not None:
+                    handlers[name] = handler
+        
+        return handlers
+    
+    @classmethod
+    def is_supported(cls, section: str, name: str, endpoint_config: Dict[str, Any]) -> bool:
+        """Whether an endpoint of the given config section can be built by this factory"""
+        if section == 'static_endpoints':
+            return name in cls.STATIC_ENDPOINTS
+        if section == 'year_dependent_endpoints':
+            return name in cls.YEAR_DEPENDENT_ENDPOINTS and bool(endpoint_config.get('year_dependent'))
+        if section == 'race_specific_endpoints':
+            return name in cls.RACE_DEPENDENT_ENDPOINTS and bool(endpoint_config.get('race_dependent'))
+        return False
+    
+    @classmethod
+    def check_config(cls, section: str, name: str, endpoint_config: Dict[str, Any]) -> _URLConfig:
+        """
+        Resolve an endpoint's settings into the handler's URL configuration
+        
+        Builds only the lightweight _URLConfig, so it runs every check a
+        handler would without building one.
+        
+        Args:
+            section: Top-level YAML section the endpoint was declared in
+            name: Endpoint name
+            endpoint_config: Settings for that endpoint
+            
+        Returns:
+            The URL configuration the handler is built from
+            
+        Raises:
+            ValueError: If the handler for this endpoint could not be built
+        """
+        static = section == 'static_endpoints'
+        race_dependent = section == 'race_specific_endpoints'
+        try:
+            return _URLConfig(
+                url=endpoint_config.get('url') if static else None,
+                template_url=None if static else endpoint_config.get('template_url'),
+                year_dependent=not static and (race_dependent or endpoint_config.get('year_dependent', True)),
+                race_dependent=race_dependent,
+                current_race=endpoint_config.get('current_race', 1) if race_dependent else 0,
+                current_year=endpoint_config.get('current_year', 2023)
+            )
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+    
+    @classmethod
+    def _build_handler(cls, section: str, name: str, endpoint_config: Dict[str, Any]) -> Any:
+        """
+        Build a single handler for an endpoint of the given config section
+        
+        Args:
+            section: Top-level YAML section the endpoint was declared in
+            name: Endpoint name
+            endpoint_config: Settings for that endpoint
+            
+        Returns:
+            The handler instance or None if the endpoint is not supported
+        """
+        if not cls.is_supported(section, name, endpoint_config):
+            return None
+        config = cls.check_config(section, name, endpoint_config)
+        
         # Process static endpoints
-        for name, endpoint_config in config.get('static_endpoints', {}).items():
-            if name in cls.STATIC_ENDPOINTS:
-                handlers[name] = cls.STATIC_ENDPOINTS[name](url=endpoint_config['url'])
+        if section == 'static_endpoints':
+            return StaticURL(url=config.url)
         
         # Process year-dependent endpoints
-        for name, endpoint_config in config.get('year_dependent_endpoints', {}).items():
-            if name in cls.YEAR_DEPENDENT_ENDPOINTS and endpoint_config.get('year_dependent'):
-                handlers[name] = cls.YEAR_DEPENDENT_ENDPOINTS[name](
-                    template_url=endpoint_config['template_url'],
-                    year_dependent=endpoint_config.get('year_dependent', True),
-                    current_year=endpoint_config.get('current_year', 2023)
-                )
+        if section == 'year_dependent_endpoints':
+            return YearDependentURL(
+                template_url=config.template_url,
+                year_dependent=config.year_dependent,
+                current_year=config.current_year,
+                record_path=cls.RECORD_PATHS.get(name)
+            )
         
         # Process race-dependent endpoints
-        for name, endpoint_config in config.get('race_specific_endpoints', {}).items():
-            if name in cls.RACE_DEPENDENT_ENDPOINTS and endpoint_config.get('race_dependent'):
-                handlers[name] = cls.RACE_DEPENDENT_ENDPOINTS[name](
-                    template_url=endpoint_config['template_url'],
-                    race_dependent=True,
-                    current_year=endpoint_config.get('current_year', 2023),
-                    current_race=endpoint_config.get('current_race', 1)
-                )
-        
-        return handlers
+        return RaceDependentURL(
+            template_url=config.template_url,
+            current_year=config.current_year,
+            current_race=config.current_race,
+            record_path=cls.RECORD_PATHS.get(name)
+        )
     
     @classmethod
     def get_handler(cls, config: Dict[str, Any], handler_name: str) -> Any:
         """
         Get a specific handler by name
         
+        Only the requested handler is built. Built handlers are cached per
+        endpoint settings, and every call returns its own shallow copy, so
+        set_context on the result does not leak into other callers.
+        
         Args:
             config: Configuration dictionary
             handler_name: Name of the handler to get
@@ -85,17 +149,72 @@ class URLFactory:
         Returns:
             The requested handler instance or None if not found
         """
-        handlers = cls.from_config(config)
-        return handlers.get(handler_name)
+        for section in cls.CONFIG_SECTIONS:
+            endpoint_config = config.get(section, {}).get(handler_name)
+            if endpoint_config is None:
+                continue
+            
+            # JSON gives a stable, hashable key even for nested settings
+            key = (section, handler_name, json.dumps(endpoint_config, sort_keys=True, default=str))
+            if key not in cls._handler_cache:
+                if len(cls._handler_cache) >= cls._HANDLER_CACHE_SIZE:
+                    # Evict the oldest entry to keep the cache bounded
+                    del cls._handler_cache[next(iter(cls._handler_cache))]
+                cls._handler_cache[key] = cls._build_handler(section, handler_name, endpoint_config)
+            
+            handler = cls._handler_cache[key]
+            return copy.copy(handler) if handler is not None else None
+        
+        return None
+
+
+class LazyHandlers(Mapping):
+    """Read-only mapping of endpoint name to URL handler, building each handler on first access"""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Collect and check the supported endpoints without instantiating any handler
+        
+        Args:
+            config: Dictionary containing endpoint configurations
+            
+        Raises:
+            ValueError: If an endpoint's settings would fail handler construction
+        """
+        self._specs = {
+            name: (section, endpoint_config)
+            for section in URLFactory.CONFIG_SECTIONS
+            for name, endpoint_config in config.get(section, {}).items()
+            if URLFactory.is_supported(section, name, endpoint_config)
+        }
+        for name, (section, endpoint_config) in self._specs.items():
+            URLFactory.check_config(section, name, endpoint_config)
+        self._handlers = {}
+    
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._handlers:
+            section, endpoint_config = self._specs[name]
+            self._handlers[name] = URLFactory._build_handler(section, name, endpoint_config)
+        return self._handlers[name]
+    
+    def __iter__(self):
+        return iter(self._specs)
+    
+    def __len__(self) -> int:
+        return len(self._specs)
 
 
-def create_handlers_from_yaml(yaml_path: str, yaml_file: str) -> Dict[str, Any]:
+def create_handlers_from_yaml(yaml_path: str, yaml_file: str,
+                              config: Optional[Dict[str, Any]] = None,
+                              lazy: bool = False) -> Mapping[str, Any]:
     """
     Create URL handlers from YAML configuration file
     
     Args:
         yaml_path: Path to the YAML file
         yaml_file: Name of the YAML file
+        config: Already parsed configuration; skips loading the file when given
+        lazy: Return a LazyHandlers mapping that builds handlers on first access
         
     Returns:
         Dictionary of URL handlers
@@ -105,10 +224,13 @@ def create_handlers_from_yaml(yaml_path: str, yaml_file: str) -> Dict[str, Any]:
     
     # Load YAML config
     config_path = os.path.join(yaml_path, yaml_file)
-    config = load_yaml_file(config_path)
+    if config is None:
+        config = load_yaml_file(config_path)
     
     if not config:
         raise ValueError(f"Failed to load configuration from {config_path}")
     
     # Create handlers
+    if lazy:
+        return LazyHandlers(config)
     return URLFactory.from_config(config)
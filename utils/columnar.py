@@ -0,0 +1,29 @@
+import logging
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional dependency - records stay as lists of dicts
+    pa = None
+
+log = logging.getLogger(__name__)
+
+
+def to_columnar(records):
+    """
+    Convert a list of records to an Arrow table.
+
+    Args:
+        records (list): Records parsed from an endpoint payload
+
+    Returns:
+        pyarrow.Table or list: The table, or the records unchanged when pyarrow
+        is missing or cannot represent them
+    """
+    if pa is None or not isinstance(records, list) or not records:
+        return records
+
+    try:
+        return pa.Table.from_pylist(records)
+    except pa.ArrowException as e:
+        log.warning("Keeping records as dicts, Arrow conversion failed: %s", e)
+        return records
@@ -0,0 +1,68 @@
+import importlib.util
+import httpx
+
+try:
+    import hishel
+except ImportError:  # Optional dependency - fall back to uncached clients
+    hishel = None
+
+# Written against the hishel 0.0.x transport API; other releases fall back to uncached clients
+_HISHEL_API = ('CacheTransport', 'AsyncCacheTransport', 'FileStorage', 'AsyncFileStorage', 'Controller')
+if hishel is not None and not all(hasattr(hishel, name) for name in _HISHEL_API):
+    hishel = None
+
+
+def _cache_controller():
+    """
+    Revalidate with ETag/Last-Modified and reuse stale entries when allowed.
+
+    Requests for immutable (past-season) data can skip revalidation entirely
+    by passing extensions={'force_cache': True}.
+    """
+    return hishel.Controller(allow_heuristics=True, allow_stale=True)
+
+
+def build_client(cache_dir=None):
+    """
+    Create the shared synchronous client.
+
+    Args:
+        cache_dir (str): Directory for the on-disk response cache, None disables it
+
+    Returns:
+        httpx.Client: Keep-alive client, cached through hishel when installed
+    """
+    transport = httpx.HTTPTransport(
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive
+        http2=importlib.util.find_spec('h2') is not None,
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
+    if cache_dir and hishel is not None:
+        transport = hishel.CacheTransport(
+            transport=transport,
+            storage=hishel.FileStorage(base_path=cache_dir),
+            controller=_cache_controller()
+        )
+    return httpx.Client(transport=transport, timeout=10.0)
+
+
+def build_async_client(cache_dir=None):
+    """
+    Create a pooled async client for one batch of concurrent requests.
+
+    Args:
+        cache_dir (str): Directory for the on-disk response cache, None disables it
+
+    Returns:
+        httpx.AsyncClient: Pooled client, cached through hishel when installed
+    """
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    )
+    if cache_dir and hishel is not None:
+        transport = hishel.AsyncCacheTransport(
+            transport=transport,
+            storage=hishel.AsyncFileStorage(base_path=cache_dir),
+            controller=_cache_controller()
+        )
+    return httpx.AsyncClient(transport=transport, timeout=10.0)
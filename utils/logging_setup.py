@@ -0,0 +1,39 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Listener started by configure_logging, reused on later calls
+_listener = None
+
+
+def configure_logging(level=logging.INFO):
+    """
+    Route log records through a queue drained by a background thread.
+
+    Callers only enqueue records, so formatting and the stderr write happen
+    off the fetch path. The listener is stopped (and flushed) at exit.
+    Calling this again only updates the level.
+
+    Args:
+        level (int): Root logger level
+
+    Returns:
+        QueueListener: The running listener
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return _listener
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root.addHandler(QueueHandler(log_queue))
+    return _listener
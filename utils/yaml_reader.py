@@ -1,25 +1,80 @@
+import json
+import logging
 import os
+from functools import lru_cache
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+_Loader = yaml.CSafeLoader if hasattr(yaml, 'CSafeLoader') else yaml.SafeLoader
+
+log = logging.getLogger(__name__)
+
 def load_yaml_file(file_path):
     """
     Load and parse a YAML file.
-    
+
+    Results are memoized in-process on (absolute path, mtime), so repeated
+    loads of an unchanged file return the same object. Treat it as read-only.
+
     Args:
         file_path (str): Path to the YAML file
-        
+
     Returns:
         dict: Parsed YAML data
     """
+    try:
+        abs_path = os.path.abspath(file_path)
+        mtime = os.path.getmtime(abs_path)
+    except OSError:
+        return _parse_yaml_file(file_path)
+    return _load_yaml_cached(abs_path, mtime)
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(abs_path, mtime):
+    """Memoized wrapper around _parse_yaml_file; mtime is only part of the key"""
+    return _parse_yaml_file(abs_path)
+
+
+def _parse_yaml_file(file_path):
+    """
+    Parse a YAML file without the in-process memoization.
+
+    The parsed result is cached next to the YAML file as JSON and reused
+    while the cache is at least as new as the YAML source.
+
+    Args:
+        file_path (str): Path to the YAML file
+
+    Returns:
+        dict: Parsed YAML data
+    """
+    cache_path = file_path + ".cache.json"
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            with open(cache_path, 'r') as cache_file:
+                return json.load(cache_file)
+    except (OSError, ValueError):
+        # Missing, stale or unreadable cache - fall back to parsing the YAML
+        pass
+
     try:
         with open(file_path, 'r') as file:
-            data = yaml.safe_load(file)
-            return data
+            data = yaml.load(file, Loader=_Loader)
     except FileNotFoundError:
-        print(f"Error: The file {file_path} was not found.")
+        log.error("The file %s was not found.", file_path)
         return None
     except yaml.YAMLError as e:
-        print(f"Error parsing YAML file: {e}")
+        log.error("Error parsing YAML file: %s", e)
         return None
 
-
+    try:
+        serialized = json.dumps(data)
+        # JSON is lossy for some YAML (e.g. int keys become strings) - only cache exact round-trips
+        if json.loads(serialized) == data:
+            with open(cache_path, 'w') as cache_file:
+                cache_file.write(serialized)
+    except (OSError, TypeError, ValueError):
+        # Read-only config dir or data JSON can't represent - just skip caching
+        pass
+    return data